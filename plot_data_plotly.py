@@ -21,49 +21,230 @@ Examples:
     python3 plot_data_plotly.py --save-html plots.html
 """
 
+import numpy as np
 import pandas as pd
 import glob
+import fnmatch
 import os
 import re
 import argparse
-from datetime import datetime, timedelta
+import csv
+import hashlib
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 
-# Try to import plotly
+# plotly is imported on first use by ensure_plotly(), so runs that only read, list or
+# save data don't pay for the import
+go = None
+make_subplots = None
+PLOTLY_AVAILABLE = None  # None until ensure_plotly() has tried the import
+
+# Optional multithreaded CSV parser (pip install pyarrow)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Optional fast MinMax/LTTB downsamplers (pip install tsdownsample)
 try:
-    import plotly.graph_objects as go
-    from plotly.subplots import make_subplots
-    import plotly.offline as pyo
-    PLOTLY_AVAILABLE = True
+    from tsdownsample import MinMaxDownsampler, LTTBDownsampler
+    TSDOWNSAMPLE_AVAILABLE = True
 except ImportError:
-    PLOTLY_AVAILABLE = False
-    print("Warning: plotly is not available. Please install it:")
-    print("  pip install plotly")
-    print("\nYou can still use this script to read and save CSV data.")
+    TSDOWNSAMPLE_AVAILABLE = False
+
+# Session timestamp (and optional split file number) in recording filenames,
+# e.g. robot_data_2026-01-13_23-01-19_001.csv
+FILE_TIMESTAMP_RE = re.compile(r'(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})(?:_(\d{3}))?')
+FILE_TIMESTAMP_FORMAT = "%Y-%m-%d_%H-%M-%S"
+
+# Columns added by the reader rather than recorded from RTDE
+METADATA_COLUMNS = frozenset(['timestamp', 'real_time', 'relative_time', 'datetime', 'session_timestamp',
+                              'file_number', 'source_file'])
+
+# pyarrow CSV block size: larger blocks mean fewer, bigger parse tasks per thread
+CSV_BLOCK_SIZE = 8 * 1024 * 1024
+
+# pandas C-engine settings used when pyarrow isn't installed
+PANDAS_READ_KWARGS = dict(engine='c', low_memory=False, float_precision='high')
+
+# Rows per chunk when reading with pandas (bounds the float64 parse buffers)
+CSV_CHUNK_ROWS = 200_000
+
+# Read files in parallel when at least this many files are loaded
+PARALLEL_READ_MIN_FILES = 4
+
+# Maximum number of points sent to the browser per trace (~2x the pixel width of a wide plot)
+DEFAULT_MAX_POINTS = 4000
+
+
+def ensure_plotly():
+    """
+    Import plotly if that hasn't been done yet.
+    
+    Returns:
+        True if plotly is available, False otherwise
+    """
+    global go, make_subplots, PLOTLY_AVAILABLE
+    if PLOTLY_AVAILABLE is None:
+        try:
+            import plotly.graph_objects as go
+            from plotly.subplots import make_subplots
+            PLOTLY_AVAILABLE = True
+        except ImportError:
+            PLOTLY_AVAILABLE = False
+            print("Warning: plotly is not available. Please install it:")
+            print("  pip install plotly")
+    return PLOTLY_AVAILABLE
+
+
+def iter_csv_chunks(csv_file, columns=None, float32=True, chunksize=CSV_CHUNK_ROWS):
+    """
+    Read a CSV file as a sequence of DataFrames.
+    
+    Data columns are downcast to float32 as each chunk is parsed, so a float64 copy of
+    the whole file never exists in pandas. pyarrow parses the whole file with all cores
+    and casts in Arrow (a single chunk); the pandas fallback reads chunksize rows at a time.
+    
+    Args:
+        csv_file: Path to CSV file
+        columns: Collection of column names to keep (optional, default: all columns)
+        float32: Store data columns as float32 instead of float64 (default: True)
+        chunksize: Rows per chunk for the pandas fallback
+        
+    Yields:
+        DataFrames with the requested columns (at least one, possibly empty)
+    """
+    usecols = None
+    if columns is not None:
+        # Only parse columns that are both requested and present in this file
+        # csv.reader, so quoted header names match the names pandas/pyarrow parse
+        with open(csv_file, 'r', newline='') as f:
+            header = next(csv.reader(f), [])
+        usecols = [col for col in header if col in columns]
+    
+    if PYARROW_AVAILABLE:
+        # Parse straight into an Arrow table; numeric columns convert to NumPy without copying
+        table = pacsv.read_csv(
+            csv_file,
+            read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE, use_threads=True),
+            convert_options=pacsv.ConvertOptions(include_columns=usecols,
+                                                 column_types={'timestamp': pa.float64()})
+        )
+        if float32:
+            # Cast column by column so only one extra column is alive at a time
+            for i, field in enumerate(table.schema):
+                if field.name != 'timestamp' and pa.types.is_float64(field.type):
+                    table = table.set_column(i, field.name, table.column(i).cast(pa.float32()))
+        yield table.to_pandas()
+        return
+    
+    # pyarrow not installed: fall back to the pandas C engine, chunk by chunk
+    n_chunks = 0
+    with pd.read_csv(csv_file, usecols=usecols, dtype={'timestamp': 'float64'}, chunksize=chunksize,
+                     **PANDAS_READ_KWARGS) as reader:
+        for chunk in reader:
+            n_chunks += 1
+            yield downcast_float_columns(chunk) if float32 else chunk
+    if n_chunks == 0:
+        yield pd.read_csv(csv_file, usecols=usecols, nrows=0)
+
+
+def downcast_float_columns(df):
+    """
+    Convert float64 data columns to float32 in place.
+    
+    RTDE values carry ~6 significant digits, so float32 halves memory without visible loss.
+    timestamp stays float64 to keep sub-millisecond precision on absolute times.
+    
+    Args:
+        df: DataFrame to convert
+        
+    Returns:
+        The same DataFrame
+    """
+    float_cols = df.select_dtypes('float64').columns.difference(['timestamp'])
+    if len(float_cols):
+        df[float_cols] = df[float_cols].astype(np.float32)
+    return df
+
+
+def read_csv_file(csv_file, columns=None, float32=True):
+    """
+    Read a CSV file, preferring the multithreaded pyarrow parser when available.
+    
+    Args:
+        csv_file: Path to CSV file
+        columns: Collection of column names to keep (optional, default: all columns)
+        float32: Store data columns as float32 instead of float64 (default: True)
+        
+    Returns:
+        DataFrame with the requested columns
+    """
+    chunks = list(iter_csv_chunks(csv_file, columns=columns, float32=float32))
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
+
+
+@lru_cache(maxsize=None)
+def parse_file_timestamp(file_timestamp_str):
+    """
+    Parse a session timestamp taken from a recording filename.
+    
+    Cached because every file of a session carries the same timestamp.
+    
+    Args:
+        file_timestamp_str: Timestamp string, e.g. "2026-01-13_23-01-19"
+        
+    Returns:
+        datetime of the session start
+    """
+    # Rearrange to ISO 8601 ("2026-01-13T23:01:19"): fromisoformat is a C parser,
+    # much faster than the format-driven strptime
+    s = file_timestamp_str
+    return datetime.fromisoformat(f"{s[:10]}T{s[11:13]}:{s[14:16]}:{s[17:19]}")
+
+
+def file_start_time_from_filename(csv_file):
+    """
+    Get a file's start time from the timestamp in its name, or its creation time if there is none.
+    
+    Args:
+        csv_file: Path to CSV file
+        
+    Returns:
+        datetime of the file start
+    """
+    match = FILE_TIMESTAMP_RE.search(csv_file)
+    if match:
+        return parse_file_timestamp(match.group(1))
+    return datetime.fromtimestamp(os.path.getctime(csv_file))
 
 
-def convert_timestamps_from_filename(csv_file):
+def convert_timestamps_from_filename(csv_file, columns=None, float32=True):
     """
     Convert timestamps to datetime. Handles both physical timestamps (Unix) and relative timestamps.
     
+    relative_time is not added here; read_all_csv_files computes it once for the combined data.
+    
     Args:
         csv_file: Path to CSV file
+        columns: Collection of column names to read (optional, default: all columns)
+        float32: Store data columns as float32 instead of float64 (default: True)
         
     Returns:
         DataFrame with converted timestamps and file start time
     """
     # Read CSV
-    df = pd.read_csv(csv_file)
+    df = read_csv_file(csv_file, columns=columns, float32=float32)
     
     if len(df) == 0:
         # Extract timestamp from filename as fallback
-        match = re.search(r'(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})', csv_file)
-        if match:
-            file_timestamp_str = match.group(1)
-            file_start_time = datetime.strptime(file_timestamp_str, "%Y-%m-%d_%H-%M-%S")
-        else:
-            file_start_time = datetime.fromtimestamp(os.path.getctime(csv_file))
-        return df, file_start_time
+        return df, file_start_time_from_filename(csv_file)
     
     first_timestamp = df['timestamp'].iloc[0]
     
@@ -77,50 +258,156 @@ def convert_timestamps_from_filename(csv_file):
         df['datetime'] = pd.to_datetime(df['timestamp'], unit='s')
         df['real_time'] = df['datetime']
         
-        # Calculate relative time from start of recording
-        first_datetime = df['datetime'].iloc[0]
-        df['relative_time'] = (df['datetime'] - first_datetime).dt.total_seconds()
-        
         file_start_time = df['datetime'].iloc[0].to_pydatetime()
     else:
-        # Relative timestamps: Use filename to determine start time (legacy support)
-        match = re.search(r'(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})', csv_file)
-        if match:
-            file_timestamp_str = match.group(1)
-            file_start_time = datetime.strptime(file_timestamp_str, "%Y-%m-%d_%H-%M-%S")
-        else:
-            # Fallback to file creation time
-            file_start_time = datetime.fromtimestamp(os.path.getctime(csv_file))
+        # Relative timestamps: Use filename (or file creation time) to determine start time (legacy support)
+        file_start_time = file_start_time_from_filename(csv_file)
         
-        # Calculate controller start time
-        controller_start_time = file_start_time - timedelta(seconds=first_timestamp)
+        # Calculate controller start time (int64 nanoseconds since the epoch)
+        controller_start_ns = (np.datetime64(file_start_time, 'ns').astype(np.int64)
+                               - np.int64(np.rint(first_timestamp * 1e9)))
         
-        # Convert all timestamps to real clock time
-        df['real_time'] = df['timestamp'].apply(
-            lambda ts: controller_start_time + timedelta(seconds=ts)
-        )
+        # Convert all timestamps to real clock time (vectorized, no per-row Python calls).
+        # Request float64 explicitly so an object-dtype column can't slip into the arithmetic.
+        timestamp_s = df['timestamp'].to_numpy(dtype=np.float64, copy=False)
+        timestamp_ns = np.rint(timestamp_s * 1e9).astype(np.int64)
+        df['real_time'] = (controller_start_ns + timestamp_ns).view('datetime64[ns]')
         df['datetime'] = df['real_time']
-        
-        # Also add relative time from start of recording (in seconds)
-        df['relative_time'] = df['timestamp'] - first_timestamp
     
     return df, file_start_time
 
 
-def read_all_csv_files(pattern="robot_data_*.csv", directory=".", specific_files=None):
+def get_cache_path(csv_files, directory=".", columns=None, float32=True):
+    """
+    Get the path of the Parquet cache file for a set of CSV files.
+    
+    The cache key covers each file's absolute path, modification time and size, so
+    editing, adding or removing a recording results in a new cache file.
+    
+    Args:
+        csv_files: List of CSV file paths
+        directory: Directory to store the cache file in
+        columns: Collection of column names read from the files (optional)
+        float32: Whether data columns are stored as float32
+        
+    Returns:
+        Path of the cache file (e.g., ".plot_cache_<hash>.parquet")
+    """
+    stats = {p: os.stat(p) for p in csv_files}  # one stat() per file for both mtime and size
+    key = sorted((os.path.abspath(p), st.st_mtime, st.st_size) for p, st in stats.items())
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(key).encode())
+    digest.update(repr(sorted(columns) if columns is not None else None).encode())
+    digest.update(repr(float32).encode())
+    return os.path.join(directory, f".plot_cache_{digest.hexdigest()}.parquet")
+
+
+def remove_stale_caches(cache_path):
+    """
+    Delete every other Parquet cache file next to a freshly written one.
+    
+    Only one cache is kept per directory, so re-plotting a growing recording or other
+    column sets does not pile up full copies of the data.
+    
+    Args:
+        cache_path: Path of the cache file to keep
+    """
+    directory = os.path.dirname(cache_path) or "."
+    for stale_path in glob.glob(os.path.join(glob.escape(directory), ".plot_cache_*.parquet")):
+        if os.path.abspath(stale_path) != os.path.abspath(cache_path):
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass
+
+
+def session_info_from_dataframe(combined_df, csv_files):
+    """
+    Rebuild the session info dictionary from a combined dataframe.
+    
+    Args:
+        combined_df: Combined dataframe as returned by read_all_csv_files
+        csv_files: List of CSV file paths the dataframe was built from
+        
+    Returns:
+        Dictionary with start time, files and sample count per session
+    """
+    paths_by_name = {os.path.basename(f): f for f in csv_files}
+    session_info = {}
+    for session, group in combined_df.groupby('session_timestamp', sort=False, observed=True):
+        session_info[session] = {
+            'start_time': group['real_time'].min().to_pydatetime(),
+            'files': [paths_by_name.get(name, name) for name in group['source_file'].unique()],
+            'total_samples': len(group)
+        }
+    return session_info
+
+
+def read_csv_file_with_metadata(csv_file, columns=None, float32=True):
+    """
+    Read a CSV file and extract its session information from the filename.
+    
+    Defined at module level so it can be run in a worker process.
+    
+    Args:
+        csv_file: Path to CSV file
+        columns: Collection of column names to read (optional, default: all columns)
+        float32: Store data columns as float32 instead of float64 (default: True)
+        
+    Returns:
+        Tuple (df, file_start_time, session_timestamp, file_number)
+    """
+    df, file_start_time = convert_timestamps_from_filename(csv_file, columns=columns, float32=float32)
+    
+    # Extract session info from filename; the file number is optional
+    match = FILE_TIMESTAMP_RE.search(csv_file)
+    if match:
+        session_timestamp = match.group(1)
+        file_number = int(match.group(2)) if match.group(2) else 1
+    else:
+        session_timestamp = file_start_time.strftime(FILE_TIMESTAMP_FORMAT)
+        file_number = 1
+    
+    return df, file_start_time, session_timestamp, file_number
+
+
+def read_all_csv_files(pattern="robot_data_*.csv", directory=".", specific_files=None, columns=None,
+                       use_cache=True, float32=True):
     """
     Read all CSV files matching the pattern and combine them.
     
+    The combined dataframe is cached as Parquet next to the recordings, so later runs on
+    the same (unchanged) files skip CSV parsing entirely.
+    
     Args:
         pattern: File pattern to match (default: "robot_data_*.csv")
         directory: Directory to search (default: current directory)
         specific_files: List of specific file paths to read (optional)
+        columns: Collection of column names to read (optional, default: all columns)
+        use_cache: Whether to read/write the Parquet cache (default: True)
+        float32: Store data columns as float32 instead of float64 (default: True)
         
     Returns:
         Dictionary with session data and combined dataframe
     """
+    if specific_files and any(f.endswith('.parquet') for f in specific_files):
+        # Combined data saved earlier with --save-parquet needs no CSV parsing
+        return read_parquet_files(specific_files, columns=columns, use_cache=use_cache, float32=float32)
+    
     if specific_files:
         csv_files = [f for f in specific_files if os.path.exists(f)]
+    elif pattern == "robot_data_*.csv":
+        # Fast path for the default pattern: one directory scan, no fnmatch
+        with os.scandir(directory) as entries:
+            csv_files = sorted(os.path.join(directory, e.name) for e in entries
+                               if e.name.startswith('robot_data_') and e.name.endswith('.csv'))
+    elif '/' not in pattern and os.sep not in pattern:
+        # Match names from a single directory scan; like glob, '*' skips hidden files
+        with os.scandir(directory) as entries:
+            csv_files = sorted(os.path.join(directory, e.name) for e in entries
+                               if fnmatch.fnmatch(e.name, pattern)
+                               and (pattern.startswith('.') or not e.name.startswith('.'))
+                               and e.is_file())
     else:
         csv_files = sorted(glob.glob(os.path.join(directory, pattern)))
     
@@ -130,36 +417,45 @@ def read_all_csv_files(pattern="robot_data_*.csv", directory=".", specific_files
     
     print(f"Found {len(csv_files)} CSV file(s)")
     
+    cache_path = get_cache_path(csv_files, directory, columns, float32) if use_cache else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            combined_df = pd.read_parquet(cache_path)
+            print(f"Loaded cached data: {cache_path}")
+            return combined_df, session_info_from_dataframe(combined_df, csv_files)
+        except Exception as e:
+            print(f"  Warning: could not read cache {cache_path}: {e}")
+    
     all_dataframes = []
+    file_metadata = []  # (session_timestamp, file_number, basename) per entry in all_dataframes
+    file_start_times = []
     session_info = {}
     
-    for csv_file in csv_files:
-        print(f"Reading: {os.path.basename(csv_file)}")
+    # Files are independent, so parse them in parallel; for a few files the startup
+    # cost outweighs the gain. pyarrow releases the GIL while parsing, so threads
+    # suffice and avoid pickling every DataFrame back from a worker process; the
+    # pandas fallback holds the GIL and needs processes.
+    executor = None
+    if len(csv_files) >= PARALLEL_READ_MIN_FILES:
+        executor_type = ThreadPoolExecutor if PYARROW_AVAILABLE else ProcessPoolExecutor
+        executor = executor_type(max_workers=min(len(csv_files), os.cpu_count() or 1))
+        futures = [executor.submit(read_csv_file_with_metadata, f, columns, float32) for f in csv_files]
+    
+    for k, csv_file in enumerate(csv_files):
+        basename = os.path.basename(csv_file)
+        print(f"Reading: {basename}")
         try:
-            df, file_start_time = convert_timestamps_from_filename(csv_file)
+            if executor:
+                df, file_start_time, session_timestamp, file_number = futures[k].result()
+            else:
+                df, file_start_time, session_timestamp, file_number = read_csv_file_with_metadata(
+                    csv_file, columns, float32)
             
             if len(df) > 0:
-                # Extract session info from filename
-                match = re.search(r'(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})_(\d{3})', csv_file)
-                if match:
-                    session_timestamp = match.group(1)
-                    file_number = int(match.group(2))
-                else:
-                    # Try without file number
-                    match = re.search(r'(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})', csv_file)
-                    if match:
-                        session_timestamp = match.group(1)
-                        file_number = 1
-                    else:
-                        session_timestamp = file_start_time.strftime("%Y-%m-%d_%H-%M-%S")
-                        file_number = 1
-                
-                # Add metadata columns
-                df['session_timestamp'] = session_timestamp
-                df['file_number'] = file_number
-                df['source_file'] = os.path.basename(csv_file)
-                
+                # Metadata columns are added once after the concat
                 all_dataframes.append(df)
+                file_start_times.append(file_start_time)
+                file_metadata.append((session_timestamp, file_number, basename))
                 
                 # Store session info
                 if session_timestamp not in session_info:
@@ -171,121 +467,477 @@ def read_all_csv_files(pattern="robot_data_*.csv", directory=".", specific_files
                 session_info[session_timestamp]['files'].append(csv_file)
                 session_info[session_timestamp]['total_samples'] += len(df)
             else:
-                print(f"  Warning: {os.path.basename(csv_file)} is empty")
+                print(f"  Warning: {basename} is empty")
         except Exception as e:
-            print(f"  Error reading {os.path.basename(csv_file)}: {e}")
+            print(f"  Error reading {basename}: {e}")
+    
+    if executor:
+        executor.shutdown()
     
     # Combine all dataframes
     if all_dataframes:
+        # Each file is recorded in time order, so ordering the files by start time
+        # normally yields an already sorted combined frame without a global sort.
+        # Split files of a legacy session share the filename start time, so the file
+        # number breaks ties.
+        parts = sorted(zip(file_start_times, all_dataframes, file_metadata),
+                       key=lambda p: (p[0], p[2][1]))
+        _, all_dataframes, file_metadata = zip(*parts)
+        is_sorted = all(df['real_time'].is_monotonic_increasing for df in all_dataframes) and all(
+            prev['real_time'].iloc[-1] <= cur['real_time'].iloc[0]
+            for prev, cur in zip(all_dataframes, all_dataframes[1:])
+        )
+        
         combined_df = pd.concat(all_dataframes, ignore_index=True)
         
-        # Sort by datetime/real_time (handle both datetime and timestamp formats)
-        if 'datetime' in combined_df.columns:
-            combined_df = combined_df.sort_values('datetime')
-            # Reset relative time to be from first recording
-            first_time = combined_df['datetime'].iloc[0]
-            combined_df['relative_time'] = (combined_df['datetime'] - first_time).dt.total_seconds()
-        elif 'real_time' in combined_df.columns:
-            combined_df = combined_df.sort_values('real_time')
-            # Reset relative time to be from first recording
-            first_time = combined_df['real_time'].iloc[0]
-            if isinstance(first_time, pd.Timestamp):
-                combined_df['relative_time'] = (combined_df['real_time'] - first_time).dt.total_seconds()
-            else:
-                combined_df['relative_time'] = (combined_df['real_time'] - first_time).apply(
-                    lambda x: x.total_seconds() if isinstance(x, timedelta) else x
-                )
-        else:
-            combined_df = combined_df.sort_values('timestamp')
+        # Add metadata columns by repeating the per-file values over each file's rows
+        row_counts = [len(df) for df in all_dataframes]
+        sessions, file_numbers, basenames = zip(*file_metadata)
+        session_codes, session_values = pd.factorize(np.array(sessions, dtype=object))
+        combined_df['session_timestamp'] = pd.Categorical.from_codes(
+            np.repeat(session_codes, row_counts), categories=session_values)
+        combined_df['file_number'] = np.repeat(np.array(file_numbers, dtype=np.int32), row_counts)
+        source_codes, source_values = pd.factorize(np.array(basenames, dtype=object))
+        combined_df['source_file'] = pd.Categorical.from_codes(
+            np.repeat(source_codes, row_counts), categories=source_values)
+        
+        if not is_sorted:
+            # Overlapping files: one stable sort, keeping a fresh RangeIndex
+            combined_df = combined_df.sort_values('real_time', kind='stable', ignore_index=True)
+        
+        # Reset relative time to be from first recording (int64 nanosecond arithmetic)
+        real_time_ns = combined_df['real_time'].to_numpy('datetime64[ns]').view('i8')
+        combined_df['relative_time'] = (real_time_ns - real_time_ns[0]) * 1e-9
+        
+        if cache_path:
+            try:
+                combined_df.to_parquet(cache_path, compression='zstd', index=False)
+                remove_stale_caches(cache_path)
+            except Exception as e:
+                # Caching is optional (e.g., pyarrow not installed)
+                print(f"  Warning: could not write cache {cache_path}: {e}")
         
         return combined_df, session_info
     else:
         return None, None
 
 
-def plot_tcp_force_plotly(df, time_column='relative_time', save_path=None, show=True):
+def read_parquet_files(files, columns=None, use_cache=True, float32=True):
     """
-    Plot TCP force components using Plotly.
+    Read combined data saved as Parquet (see --save-parquet), plus any CSV files given with it.
     
     Args:
-        df: DataFrame with data
-        time_column: Column to use for x-axis
-        save_path: Path to save HTML file (optional)
-        show: Whether to open in browser (default: True)
+        files: List of .parquet and/or CSV file paths
+        columns: Collection of column names to read (optional, default: all columns)
+        use_cache: Whether to use the Parquet cache for the CSV files (default: True)
+        float32: Store CSV data columns as float32 instead of float64 (default: True)
+        
+    Returns:
+        Tuple (combined dataframe, session info dictionary), or (None, None) if nothing was read
     """
-    if not PLOTLY_AVAILABLE:
-        print("Error: plotly is not available. Cannot create plots.")
-        return None
+    parquet_files = [f for f in files if f.endswith('.parquet') and os.path.exists(f)]
+    other_files = [f for f in files if not f.endswith('.parquet')]
     
-    force_cols = [col for col in df.columns if 'actual_TCP_force' in col]
+    frames = []
+    for parquet_file in parquet_files:
+        print(f"Reading: {os.path.basename(parquet_file)}")
+        try:
+            df = pd.read_parquet(parquet_file)
+            if columns is not None:
+                df = df[[col for col in df.columns if col in columns or col in METADATA_COLUMNS]]
+            frames.append(df)
+        except Exception as e:
+            print(f"  Error reading {os.path.basename(parquet_file)}: {e}")
     
-    if not force_cols:
-        print("No TCP force columns found")
-        return None
+    if other_files:
+        csv_df, _ = read_all_csv_files(specific_files=other_files, columns=columns,
+                                       use_cache=use_cache, float32=float32)
+        if csv_df is not None:
+            frames.append(csv_df)
     
-    # Create subplots
-    fig = make_subplots(
-        rows=2, cols=1,
-        subplot_titles=('TCP Forces (X, Y, Z)', 'TCP Torques (Rx, Ry, Rz)'),
-        vertical_spacing=0.1
-    )
+    if not frames:
+        return None, None
+    
+    combined_df = pd.concat(frames, ignore_index=True)
+    # Frames with different categories concatenate to object columns
+    for col in ('session_timestamp', 'source_file'):
+        if col in combined_df.columns and combined_df[col].dtype != 'category':
+            combined_df[col] = combined_df[col].astype('category')
+    if not combined_df['real_time'].is_monotonic_increasing:
+        combined_df = combined_df.sort_values('real_time', kind='stable', ignore_index=True)
     
+    # Reset relative time to be from the first recording of the combined data
+    real_time_ns = combined_df['real_time'].to_numpy('datetime64[ns]').view('i8')
+    combined_df['relative_time'] = (real_time_ns - real_time_ns[0]) * 1e-9
+    
+    return combined_df, session_info_from_dataframe(combined_df, files)
+
+
+def minmax_decimate(y, n_bins):
+    """
+    Find the positions of the minimum and maximum sample in each of n_bins equal bins.
+    
+    Args:
+        y: 1-D array of samples (len(y) >= n_bins)
+        n_bins: Number of bins
+        
+    Returns:
+        int64 array of length 2 * n_bins with the (min, max) positions of each bin in time order
+    """
+    bin_size = len(y) // n_bins
+    bins = y[:n_bins * bin_size].reshape(n_bins, bin_size)
+    offsets = np.arange(n_bins) * bin_size
+    argmin = offsets + bins.argmin(axis=1)
+    argmax = offsets + bins.argmax(axis=1)
+    indices = np.empty(2 * n_bins, dtype=np.int64)
+    indices[0::2] = np.minimum(argmin, argmax)
+    indices[1::2] = np.maximum(argmin, argmax)
+    return indices
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Select n_out samples with the Largest-Triangle-Three-Buckets (LTTB) algorithm.
+    
+    The first and last samples are always kept; the samples in between are split into
+    n_out - 2 buckets and from each bucket the sample forming the largest triangle with
+    the previously selected sample and the average of the next bucket is kept.
+    
+    Args:
+        x: 1-D array of x values (numeric or datetime64)
+        y: 1-D array of samples (len(y) > n_out)
+        n_out: Number of samples to select (>= 3)
+        
+    Returns:
+        int64 array of n_out sample positions in time order
+    """
+    n = len(y)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.view(np.int64)
+    # Shift x to start at 0 so the area products keep their precision for epoch times
+    x = x.astype(np.float64) - float(x[0])
+    y = y.astype(np.float64)
+    
+    # Bucket b holds samples [edges[b], edges[b + 1]); bucket averages via cumulative sums
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    counts = np.diff(edges)
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    avg_x = (cum_x[edges[1:]] - cum_x[edges[:-1]]) / counts
+    avg_y = (cum_y[edges[1:]] - cum_y[edges[:-1]]) / counts
+    # The "next bucket" of the last bucket is the last sample
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+    
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs((x[a] - next_x[b]) * (y[lo:hi] - y[a])
+                      - (x[a] - x[lo:hi]) * (next_y[b] - y[a]))
+        a = lo + int(area.argmax())
+        indices[b + 1] = a
+    return indices
+
+
+def downsample(x, y, max_points=DEFAULT_MAX_POINTS, method='minmax'):
+    """
+    Reduce a trace to at most ~max_points points while preserving its visual shape.
+    
+    'minmax' splits the trace into about max_points/2 bins and keeps the minimum and maximum
+    sample of every bin, so peaks are never dropped. 'lttb' keeps the most visually
+    significant sample per bucket (see lttb_indices), which follows the line shape more
+    smoothly.
+    
+    Args:
+        x: x-axis values (array or Series)
+        y: y-axis values (array or Series)
+        max_points: Maximum number of points to keep (None or 0 disables downsampling)
+        method: 'minmax' or 'lttb' (default: 'minmax')
+        
+    Returns:
+        Tuple (x, y) of NumPy arrays
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(y)
+    if not max_points or n <= max_points or max_points < 3:
+        return x, y
+    
+    if method == 'lttb':
+        if TSDOWNSAMPLE_AVAILABLE and not np.issubdtype(x.dtype, np.datetime64):
+            indices = LTTBDownsampler().downsample(np.ascontiguousarray(x), np.ascontiguousarray(y),
+                                                   n_out=max_points)
+        else:
+            indices = lttb_indices(x, y, max_points)
+    elif TSDOWNSAMPLE_AVAILABLE:
+        # tsdownsample's MinMax needs an even n_out
+        indices = MinMaxDownsampler().downsample(np.ascontiguousarray(y), n_out=max_points - max_points % 2)
+    else:
+        # A (min, max) pair per bin plus the last sample stays within max_points
+        indices = np.unique(np.append(minmax_decimate(y, (max_points - 1) // 2), n - 1))
+    return x[indices], y[indices]
+
+
+def scatter_trace_type(renderer='webgl'):
+    """
+    Get the Plotly trace class for a renderer.
+    
+    WebGL draws hundreds of thousands of points smoothly; SVG gives crisper static
+    exports and works without GPU support.
+    
+    Args:
+        renderer: 'webgl' or 'svg'
+        
+    Returns:
+        go.Scattergl or go.Scatter
+    """
+    return go.Scatter if renderer == 'svg' else go.Scattergl
+
+
+def get_time_axis(df, time_column):
+    """
+    Get the x-axis values and label for a time column.
+    
+    Args:
+        df: DataFrame with data
+        time_column: Column to use for x-axis
+        
+    Returns:
+        Tuple (x_data, x_label, is_date) where is_date tells whether the axis should be
+        formatted as datetime
+    """
     # Convert time column to appropriate format for plotting
     if time_column == 'datetime' and 'datetime' not in df.columns:
         # Fallback to real_time if datetime not available
         time_column = 'real_time'
     
     if time_column in ['datetime', 'real_time']:
-        # For datetime columns, use datetime objects directly (Plotly handles them)
+        # For datetime columns, use datetime values directly (Plotly handles them)
         if time_column in df.columns:
-            x_data = df[time_column]
+            x_data = df[time_column].to_numpy(copy=False)
         elif 'datetime' in df.columns:
-            x_data = df['datetime']
+            x_data = df['datetime'].to_numpy(copy=False)
         else:
-            x_data = df['relative_time'].values
+            x_data = df['relative_time'].to_numpy(copy=False)
+        x_label = "Time (datetime)"
     else:
-        x_data = df[time_column].values
+        x_data = df[time_column].to_numpy(copy=False)
+        x_label = f"Time ({time_column})"
+    
+    is_date = time_column in ['datetime', 'real_time'] and 'datetime' in df.columns
+    return x_data, x_label, is_date
+
+
+def add_tcp_force_traces(fig, df, x_data, force_row, torque_row, max_points=DEFAULT_MAX_POINTS,
+                         renderer='webgl', downsampler='minmax'):
+    """
+    Add TCP force and torque traces to two rows of a subplot figure.
+    
+    Args:
+        fig: Plotly figure created with make_subplots
+        df: DataFrame with data
+        x_data: x-axis values (see get_time_axis)
+        force_row: Subplot row for the forces
+        torque_row: Subplot row for the torques
+        max_points: Maximum number of points per trace (None or 0 plots every sample)
+        renderer: 'webgl' (Scattergl) or 'svg' (Scatter)
+        downsampler: Downsampling method, 'minmax' or 'lttb' (see downsample)
+    """
+    # Look up each force column once
+    col_set = set(df.columns)
+    arrays = {i: df[f'actual_TCP_force_{i}'].to_numpy(copy=False)
+              for i in range(6) if f'actual_TCP_force_{i}' in col_set}
     
     # Plot forces (first 3 components)
     force_labels = ['X', 'Y', 'Z']
-    for i in range(min(3, len(force_cols))):
-        if f'actual_TCP_force_{i}' in df.columns:
+    for i in range(3):
+        if i in arrays:
+            x_plot, y_plot = downsample(x_data, arrays[i], max_points, downsampler)
             fig.add_trace(
-                go.Scatter(
-                    x=x_data,
-                    y=df[f'actual_TCP_force_{i}'].values,
+                scatter_trace_type(renderer)(
+                    x=x_plot,
+                    y=y_plot,
                     mode='lines',
                     name=f'Force {force_labels[i]}',
                     line=dict(width=1)
                 ),
-                row=1, col=1
+                row=force_row, col=1
             )
     
     # Plot moments (last 3 components)
-    for i in range(3, min(6, len(force_cols))):
-        if f'actual_TCP_force_{i}' in df.columns:
+    for i in range(3, 6):
+        if i in arrays:
+            x_plot, y_plot = downsample(x_data, arrays[i], max_points, downsampler)
             fig.add_trace(
-                go.Scatter(
-                    x=x_data,
-                    y=df[f'actual_TCP_force_{i}'].values,
+                scatter_trace_type(renderer)(
+                    x=x_plot,
+                    y=y_plot,
                     mode='lines',
                     name=f'Torque {force_labels[i-3]}',
                     line=dict(width=1)
                 ),
-                row=2, col=1
+                row=torque_row, col=1
             )
     
+    fig.update_yaxes(title_text="Force (N)", row=force_row, col=1)
+    fig.update_yaxes(title_text="Torque (Nm)", row=torque_row, col=1)
+
+
+def add_variable_traces(fig, df, variables, x_data, first_row=1, max_points=DEFAULT_MAX_POINTS,
+                        renderer='webgl', downsampler='minmax'):
+    """
+    Add one trace per variable to consecutive rows of a subplot figure.
+    
+    Args:
+        fig: Plotly figure created with make_subplots
+        df: DataFrame with data
+        variables: List of variable names to plot (all present in df, see available_variables)
+        x_data: x-axis values (see get_time_axis)
+        first_row: Subplot row for the first variable
+        max_points: Maximum number of points per trace (None or 0 plots every sample)
+        renderer: 'webgl' (Scattergl) or 'svg' (Scatter)
+        downsampler: Downsampling method, 'minmax' or 'lttb' (see downsample)
+    """
+    for i, var in enumerate(variables):
+        x_plot, y_plot = downsample(x_data, df[var].to_numpy(copy=False),
+                                    max_points, downsampler)
+        fig.add_trace(
+            scatter_trace_type(renderer)(
+                x=x_plot,
+                y=y_plot,
+                mode='lines',
+                name=var,
+                line=dict(width=1),
+                showlegend=True
+            ),
+            row=first_row + i, col=1
+        )
+        fig.update_yaxes(title_text=var, row=first_row + i, col=1)
+
+
+def available_variables(df, variables):
+    """
+    Keep the variables that exist in the dataframe, warning once about the others.
+    
+    Args:
+        df: DataFrame with data
+        variables: List of variable names
+        
+    Returns:
+        List of the variables found in df, in the given order
+    """
+    columns = df.columns
+    found = [var for var in variables if var in columns]
+    missing = [var for var in variables if var not in columns]
+    if missing:
+        print(f"Warning: Variable(s) not found in data: {', '.join(missing)}")
+    return found
+
+
+def add_session_traces(fig, df, variable, x_data, row=None, max_points=DEFAULT_MAX_POINTS,
+                       renderer='webgl', downsampler='minmax'):
+    """
+    Add one trace per recording session for a variable.
+    
+    Args:
+        fig: Plotly figure
+        df: DataFrame with data
+        variable: Variable name to plot
+        x_data: x-axis values (see get_time_axis)
+        row: Subplot row (optional, for figures created with make_subplots)
+        max_points: Maximum number of points per trace (None or 0 plots every sample)
+        renderer: 'webgl' (Scattergl) or 'svg' (Scatter)
+        downsampler: Downsampling method, 'minmax' or 'lttb' (see downsample)
+    """
+    # Select each session by its row positions in the pre-extracted arrays
+    y_data = df[variable].to_numpy(copy=False)
+    session_indices = df.groupby('session_timestamp', sort=False, observed=True).indices
+    col = 1 if row else None
+    
+    for session, idx in session_indices.items():
+        if idx[-1] - idx[0] + 1 == len(idx):
+            # Sessions are normally contiguous in the time-sorted frame: slice (a view)
+            # instead of gathering a copy with fancy indexing
+            idx = slice(idx[0], idx[-1] + 1)
+        x_plot, y_plot = downsample(x_data[idx], y_data[idx],
+                                    max_points, downsampler)
+        fig.add_trace(
+            scatter_trace_type(renderer)(
+                x=x_plot,
+                y=y_plot,
+                mode='lines',
+                name=f'Session: {session}',
+                line=dict(width=1)
+            ),
+            row=row, col=col
+        )
+
+
+def save_or_show(fig, save_path=None, show=True, include_plotlyjs='cdn'):
+    """
+    Save a figure as HTML and/or open it in the browser.
+    
+    Args:
+        fig: Plotly figure
+        save_path: Path to save HTML file (optional)
+        show: Whether to open in browser (default: True)
+        include_plotlyjs: 'cdn' to load plotly.js from the CDN (small files, needs internet
+            to view) or True to embed it (~3.5 MB per file, works offline)
+    """
+    if save_path:
+        # The figure was built from validated traces; skip re-validating it on write
+        fig.write_html(save_path, include_plotlyjs=include_plotlyjs, include_mathjax=False,
+                       full_html=True, validate=False, auto_play=False)
+        print(f"Saved: {save_path}")
+        if show:
+            fig.show()
+    elif show:
+        fig.show()
+
+
+def plot_tcp_force_plotly(df, time_column='relative_time', save_path=None, show=True,
+                          max_points=DEFAULT_MAX_POINTS, renderer='webgl',
+                          downsampler='minmax', include_plotlyjs='cdn'):
+    """
+    Plot TCP force components using Plotly.
+    
+    Args:
+        df: DataFrame with data
+        time_column: Column to use for x-axis
+        save_path: Path to save HTML file (optional)
+        show: Whether to open in browser (default: True)
+        max_points: Maximum number of points per trace (None or 0 plots every sample)
+        renderer: 'webgl' (Scattergl) or 'svg' (Scatter)
+        downsampler: Downsampling method, 'minmax' or 'lttb' (see downsample)
+        include_plotlyjs: How plotly.js is included in the HTML file (see save_or_show)
+    """
+    if not ensure_plotly():
+        print("Error: plotly is not available. Cannot create plots.")
+        return None
+    
+    if not any(col.startswith('actual_TCP_force_') for col in df.columns):
+        print("No TCP force columns found")
+        return None
+    
+    # Create subplots
+    fig = make_subplots(
+        rows=2, cols=1,
+        subplot_titles=('TCP Forces (X, Y, Z)', 'TCP Torques (Rx, Ry, Rz)'),
+        vertical_spacing=0.1
+    )
+    
+    x_data, x_label, is_date = get_time_axis(df, time_column)
+    add_tcp_force_traces(fig, df, x_data, force_row=1, torque_row=2, max_points=max_points,
+                         renderer=renderer, downsampler=downsampler)
+    
     # Update axes labels
-    if time_column in ['datetime', 'real_time']:
-        x_label = "Time (datetime)"
-    else:
-        x_label = f"Time ({time_column})"
     fig.update_xaxes(title_text=x_label, row=2, col=1)
-    fig.update_yaxes(title_text="Force (N)", row=1, col=1)
-    fig.update_yaxes(title_text="Torque (Nm)", row=2, col=1)
     
     # Format x-axis as datetime if using datetime column
-    if time_column in ['datetime', 'real_time'] and 'datetime' in df.columns:
+    if is_date:
         fig.update_xaxes(type='date', row=1, col=1)
         fig.update_xaxes(type='date', row=2, col=1)
     
@@ -297,19 +949,13 @@ def plot_tcp_force_plotly(df, time_column='relative_time', save_path=None, show=
         showlegend=True
     )
     
-    # Save or show
-    if save_path:
-        fig.write_html(save_path)
-        print(f"Saved: {save_path}")
-        if show:
-            fig.show()
-    elif show:
-        fig.show()
-    
+    save_or_show(fig, save_path, show, include_plotlyjs)
     return fig
 
 
-def plot_variables_plotly(df, variables, time_column='relative_time', save_path=None, show=True):
+def plot_variables_plotly(df, variables, time_column='relative_time', save_path=None, show=True,
+                          max_points=DEFAULT_MAX_POINTS, renderer='webgl',
+                          downsampler='minmax', include_plotlyjs='cdn'):
     """
     Plot specified variables using Plotly.
     
@@ -319,8 +965,12 @@ def plot_variables_plotly(df, variables, time_column='relative_time', save_path=
         time_column: Column to use for x-axis
         save_path: Path to save HTML file (optional)
         show: Whether to open in browser (default: True)
+        max_points: Maximum number of points per trace (None or 0 plots every sample)
+        renderer: 'webgl' (Scattergl) or 'svg' (Scatter)
+        downsampler: Downsampling method, 'minmax' or 'lttb' (see downsample)
+        include_plotlyjs: How plotly.js is included in the HTML file (see save_or_show)
     """
-    if not PLOTLY_AVAILABLE:
+    if not ensure_plotly():
         print("Error: plotly is not available. Cannot create plots.")
         return None
     
@@ -328,6 +978,12 @@ def plot_variables_plotly(df, variables, time_column='relative_time', save_path=
         print("No variables specified")
         return None
     
+    # Drop unknown variables before laying out the subplots, so none stay empty
+    variables = available_variables(df, variables)
+    if not variables:
+        print("None of the specified variables were found")
+        return None
+    
     # Create subplots
     n_vars = len(variables)
     fig = make_subplots(
@@ -336,48 +992,15 @@ def plot_variables_plotly(df, variables, time_column='relative_time', save_path=
         vertical_spacing=0.05
     )
     
-    # Convert time column to appropriate format for plotting
-    if time_column == 'datetime' and 'datetime' not in df.columns:
-        # Fallback to real_time if datetime not available
-        time_column = 'real_time'
-    
-    if time_column in ['datetime', 'real_time']:
-        # For datetime columns, use datetime objects directly (Plotly handles them)
-        if time_column in df.columns:
-            x_data = df[time_column]
-        elif 'datetime' in df.columns:
-            x_data = df['datetime']
-        else:
-            x_data = df['relative_time'].values
-    else:
-        x_data = df[time_column].values
-    
-    for i, var in enumerate(variables):
-        if var in df.columns:
-            fig.add_trace(
-                go.Scatter(
-                    x=x_data,
-                    y=df[var].values,
-                    mode='lines',
-                    name=var,
-                    line=dict(width=1),
-                    showlegend=True
-                ),
-                row=i+1, col=1
-            )
-            fig.update_yaxes(title_text=var, row=i+1, col=1)
-        else:
-            print(f"Warning: Variable '{var}' not found in data")
+    x_data, x_label, is_date = get_time_axis(df, time_column)
+    add_variable_traces(fig, df, variables, x_data, first_row=1, max_points=max_points,
+                        renderer=renderer, downsampler=downsampler)
     
     # Update x-axis label on last subplot
-    if time_column in ['datetime', 'real_time']:
-        x_label = "Time (datetime)"
-    else:
-        x_label = f"Time ({time_column})"
     fig.update_xaxes(title_text=x_label, row=n_vars, col=1)
     
     # Format x-axis as datetime if using datetime column
-    if time_column in ['datetime', 'real_time'] and 'datetime' in df.columns:
+    if is_date:
         for i in range(1, n_vars + 1):
             fig.update_xaxes(type='date', row=i, col=1)
     
@@ -389,19 +1012,13 @@ def plot_variables_plotly(df, variables, time_column='relative_time', save_path=
         showlegend=True
     )
     
-    # Save or show
-    if save_path:
-        fig.write_html(save_path)
-        print(f"Saved: {save_path}")
-        if show:
-            fig.show()
-    elif show:
-        fig.show()
-    
+    save_or_show(fig, save_path, show, include_plotlyjs)
     return fig
 
 
-def plot_by_session_plotly(df, variable, time_column='relative_time', save_path=None, show=True):
+def plot_by_session_plotly(df, variable, time_column='relative_time', save_path=None, show=True,
+                           max_points=DEFAULT_MAX_POINTS, renderer='webgl',
+                           downsampler='minmax', include_plotlyjs='cdn'):
     """
     Plot a variable grouped by recording session using Plotly.
     
@@ -411,8 +1028,12 @@ def plot_by_session_plotly(df, variable, time_column='relative_time', save_path=
         time_column: Column to use for x-axis
         save_path: Path to save HTML file (optional)
         show: Whether to open in browser (default: True)
+        max_points: Maximum number of points per trace (None or 0 plots every sample)
+        renderer: 'webgl' (Scattergl) or 'svg' (Scatter)
+        downsampler: Downsampling method, 'minmax' or 'lttb' (see downsample)
+        include_plotlyjs: How plotly.js is included in the HTML file (see save_or_show)
     """
-    if not PLOTLY_AVAILABLE:
+    if not ensure_plotly():
         print("Error: plotly is not available. Cannot create plots.")
         return None
     
@@ -426,41 +1047,9 @@ def plot_by_session_plotly(df, variable, time_column='relative_time', save_path=
     
     fig = go.Figure()
     
-    # Convert time column to appropriate format for plotting
-    if time_column == 'datetime' and 'datetime' not in df.columns:
-        # Fallback to real_time if datetime not available
-        time_column = 'real_time'
-    
-    for session in df['session_timestamp'].unique():
-        session_df = df[df['session_timestamp'] == session]
-        
-        # Handle datetime columns
-        if time_column in ['datetime', 'real_time']:
-            # For datetime columns, use datetime objects directly (Plotly handles them)
-            if time_column in session_df.columns:
-                x_data = session_df[time_column]
-            elif 'datetime' in session_df.columns:
-                x_data = session_df['datetime']
-            else:
-                x_data = session_df['relative_time'].values
-        else:
-            x_data = session_df[time_column].values
-        
-        fig.add_trace(
-            go.Scatter(
-                x=x_data,
-                y=session_df[variable].values,
-                mode='lines',
-                name=f'Session: {session}',
-                line=dict(width=1)
-            )
-        )
-    
-    # Set x-axis label
-    if time_column in ['datetime', 'real_time']:
-        x_label = 'Time (datetime)'
-    else:
-        x_label = f'Time ({time_column})'
+    x_data, x_label, is_date = get_time_axis(df, time_column)
+    add_session_traces(fig, df, variable, x_data, max_points=max_points,
+                       renderer=renderer, downsampler=downsampler)
     
     fig.update_layout(
         title=f'{variable} by Recording Session',
@@ -472,28 +1061,119 @@ def plot_by_session_plotly(df, variable, time_column='relative_time', save_path=
     )
     
     # Format x-axis as datetime if using datetime column
-    if time_column in ['datetime', 'real_time'] and 'datetime' in df.columns:
+    if is_date:
         fig.update_xaxes(type='date')
     
-    # Save or show
-    if save_path:
-        fig.write_html(save_path)
-        print(f"Saved: {save_path}")
-        if show:
-            fig.show()
-    elif show:
-        fig.show()
+    save_or_show(fig, save_path, show, include_plotlyjs)
+    return fig
+
+
+def plot_all_plotly(df, variables=None, session_variable=None, time_column='relative_time',
+                    save_path=None, show=True, max_points=DEFAULT_MAX_POINTS, renderer='webgl',
+                    downsampler='minmax', include_plotlyjs='cdn'):
+    """
+    Plot TCP forces, variables and a per-session view in a single Plotly figure.
+    
+    Building one figure shares the x-axis extraction and produces a single HTML page
+    instead of one page (and browser tab) per plot.
+    
+    Args:
+        df: DataFrame with data
+        variables: List of variable names to plot (optional)
+        session_variable: Variable to plot grouped by recording session (optional)
+        time_column: Column to use for x-axis
+        save_path: Path to save HTML file (optional)
+        show: Whether to open in browser (default: True)
+        max_points: Maximum number of points per trace (None or 0 plots every sample)
+        renderer: 'webgl' (Scattergl) or 'svg' (Scatter)
+        downsampler: Downsampling method, 'minmax' or 'lttb' (see downsample)
+        include_plotlyjs: How plotly.js is included in the HTML file (see save_or_show)
+    """
+    if not ensure_plotly():
+        print("Error: plotly is not available. Cannot create plots.")
+        return None
+    
+    has_forces = any(col.startswith('actual_TCP_force_') for col in df.columns)
+    variables = available_variables(df, variables or [])
+    if session_variable not in df.columns or 'session_timestamp' not in df.columns:
+        session_variable = None
+    
+    # Lay out the rows: forces/torques, one row per variable, then the session plot
+    titles = []
+    heights = []
+    if has_forces:
+        titles += ['TCP Forces (X, Y, Z)', 'TCP Torques (Rx, Ry, Rz)']
+        heights += [400, 400]
+    titles += variables
+    heights += [300] * len(variables)
+    if session_variable:
+        titles.append(f'{session_variable} by Recording Session')
+        heights.append(600)
+    
+    if not titles:
+        print("Nothing to plot")
+        return None
+    
+    n_rows = len(titles)
+    fig = make_subplots(
+        rows=n_rows, cols=1,
+        subplot_titles=titles,
+        row_heights=heights,
+        vertical_spacing=min(0.1, 0.3 / n_rows)
+    )
     
+    x_data, x_label, is_date = get_time_axis(df, time_column)
+    row = 1
+    if has_forces:
+        add_tcp_force_traces(fig, df, x_data, force_row=1, torque_row=2, max_points=max_points,
+                             renderer=renderer, downsampler=downsampler)
+        row += 2
+    if variables:
+        add_variable_traces(fig, df, variables, x_data, first_row=row, max_points=max_points,
+                            renderer=renderer, downsampler=downsampler)
+        row += len(variables)
+    if session_variable:
+        add_session_traces(fig, df, session_variable, x_data, row=row, max_points=max_points,
+                           renderer=renderer, downsampler=downsampler)
+        fig.update_yaxes(title_text=session_variable, row=row, col=1)
+    
+    fig.update_xaxes(title_text=x_label, row=n_rows, col=1)
+    if is_date:
+        fig.update_xaxes(type='date')
+    
+    fig.update_layout(
+        height=sum(heights),
+        title_text="RTDE Recording",
+        hovermode='x unified',
+        showlegend=True
+    )
+    
+    save_or_show(fig, save_path, show, include_plotlyjs)
     return fig
 
 
+def save_combined_data(df, path, output_format='csv'):
+    """
+    Save the combined dataframe to a file.
+    
+    CSV files are always written by pandas, so their text does not depend on
+    whether pyarrow is installed.
+    
+    Args:
+        df: DataFrame with data
+        path: Output file path
+        output_format: 'csv' or 'parquet' (default: 'csv')
+    """
+    if output_format == 'parquet':
+        df.to_parquet(path, compression='zstd', index=False)
+    else:
+        df.to_csv(path, index=False, chunksize=200_000)
+
+
 def list_available_variables(df):
     """List all available variables in the dataframe."""
-    # Filter out metadata columns
-    metadata_cols = ['timestamp', 'real_time', 'relative_time', 'datetime', 'session_timestamp', 
-                     'file_number', 'source_file']
-    variables = [col for col in df.columns if col not in metadata_cols]
-    return variables
+    # Filter out metadata columns (Index set difference, keeping column order)
+    return df.columns.difference(list(METADATA_COLUMNS), sort=False).tolist()
 
 
 def parse_args():
@@ -523,7 +1203,8 @@ Examples:
     parser.add_argument(
         '--files', '-f',
         nargs='+',
-        help='Specific CSV files to read (default: all robot_data_*.csv files)',
+        help='Specific CSV files to read (default: all robot_data_*.csv files). '
+             'Parquet files written by --save-parquet can be given as well',
         default=None
     )
     
@@ -556,16 +1237,47 @@ Examples:
     parser.add_argument(
         '--plot-type',
         choices=['tcp_force', 'variables', 'by_session', 'all'],
-        help='Type of plot to generate (default: all)',
+        help='Type of plot to generate (default: all). '
+             '"all" combines every plot into a single figure (plots.html unless --save-html is given)',
         default='all'
     )
     
+    parser.add_argument(
+        '--renderer',
+        choices=['webgl', 'svg'],
+        help='Trace renderer (default: webgl). webgl stays responsive with many points; '
+             'svg works without GPU support',
+        default='webgl'
+    )
+    
+    parser.add_argument(
+        '--max-points',
+        type=int,
+        help=f'Maximum number of points per trace (default: {DEFAULT_MAX_POINTS}, 0 plots every sample)',
+        default=DEFAULT_MAX_POINTS
+    )
+    
+    parser.add_argument(
+        '--downsampler',
+        choices=['minmax', 'lttb'],
+        help='Downsampling method used with --max-points (default: minmax). '
+             'minmax keeps every peak; lttb follows the line shape more smoothly',
+        default='minmax'
+    )
+    
     parser.add_argument(
         '--save-html',
         help='Save plots as HTML file instead of opening in browser',
         default=None
     )
     
+    parser.add_argument(
+        '--embed-plotlyjs',
+        action='store_true',
+        help='Embed plotly.js in saved HTML files so they can be viewed offline '
+             '(adds ~3.5 MB per file; default: load it from the plotly CDN)'
+    )
+    
     parser.add_argument(
         '--no-show',
         action='store_true',
@@ -578,6 +1290,25 @@ Examples:
         default=None
     )
     
+    parser.add_argument(
+        '--save-parquet',
+        help='Save combined data to a Parquet file (compact and fast to read back with --files)',
+        default=None
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always re-read the CSV files instead of using the cached Parquet data'
+    )
+    
+    parser.add_argument(
+        '--full-precision',
+        action='store_true',
+        help='Keep data columns as float64 instead of float32 (uses twice the memory); '
+             'always on with --save-csv or --save-parquet'
+    )
+    
     parser.add_argument(
         '--list-variables',
         action='store_true',
@@ -591,16 +1322,26 @@ def main():
     """Main entry point."""
     args = parse_args()
     
-    if not PLOTLY_AVAILABLE:
-        print("Error: plotly is not installed.")
-        print("Install it with: pip install plotly")
-        return
+    # Only parse the requested variables (plus timestamp) when --variables is given and the
+    # plot needs nothing else. Listing variables needs every column, the 'all' and 'by_session'
+    # plots also use the force / first recorded columns, and a TCP force plot needs its columns.
+    # Saving combined data always keeps every recorded column (and float64 precision).
+    columns = None
+    saving = args.save_csv or args.save_parquet
+    if (args.variables and not args.list_variables and not saving
+            and args.plot_type in ('variables', 'tcp_force')):
+        columns = {v.strip() for v in args.variables.split(',')} | {'timestamp'}
+        if args.plot_type == 'tcp_force':
+            columns |= {f'actual_TCP_force_{i}' for i in range(6)}
     
     # Read CSV files
     df, session_info = read_all_csv_files(
         pattern=args.pattern,
         directory=args.directory,
-        specific_files=args.files
+        specific_files=args.files,
+        columns=columns,
+        use_cache=not args.no_cache,
+        float32=not (args.full_precision or saving)  # exports keep full float64 precision
     )
     
     if df is None:
@@ -638,41 +1379,74 @@ def main():
     
     # Save combined CSV if requested
     if args.save_csv:
-        df.to_csv(args.save_csv, index=False)
+        save_combined_data(df, args.save_csv)
         print(f"\nSaved combined data to: {args.save_csv}")
     
+    # Save combined Parquet if requested
+    if args.save_parquet:
+        save_combined_data(df, args.save_parquet, output_format='parquet')
+        print(f"\nSaved combined data to: {args.save_parquet}")
+    
+    if not ensure_plotly():
+        print("Error: plotly is not installed.")
+        print("Install it with: pip install plotly")
+        return
+    
     # Determine show/save settings
     show_plots = not args.no_show
     save_html = args.save_html if args.save_html else None
+    plotlyjs = True if args.embed_plotlyjs else 'cdn'  # True embeds plotly.js in the file
     
     # Generate plots
     figures = []
     
+    if args.plot_type == 'all':
+        # Everything goes into one figure / HTML page
+        variables = [v.strip() for v in args.variables.split(',')] if args.variables else []
+        available = list_available_variables(df)
+        session_variable = available[0] if available else None  # Use first available variable
+        html_path = save_html if save_html else 'plots.html'
+        fig = plot_all_plotly(df, variables, session_variable, time_column=args.time_column,
+                              save_path=html_path, show=show_plots,
+                              max_points=args.max_points,
+                              renderer=args.renderer, downsampler=args.downsampler,
+                              include_plotlyjs=plotlyjs)
+        if fig:
+            figures.append(fig)
+            save_html = html_path
+    
     # Plot TCP forces
-    if args.plot_type in ['tcp_force', 'all']:
-        if 'actual_TCP_force_0' in df.columns:
+    if args.plot_type == 'tcp_force':
+        # Skipped when no force columns were recorded or survived column pruning
+        if any(col.startswith('actual_TCP_force_') for col in df.columns):
             html_path = save_html if save_html else 'tcp_forces.html'
             fig = plot_tcp_force_plotly(df, time_column=args.time_column, 
-                                       save_path=html_path, show=show_plots)
+                                       save_path=html_path, show=show_plots,
+                                       max_points=args.max_points,
+                                       renderer=args.renderer, downsampler=args.downsampler,
+                                       include_plotlyjs=plotlyjs)
             if fig:
                 figures.append(fig)
                 if not save_html:
                     save_html = 'tcp_forces.html'  # Auto-save if not specified
     
     # Plot specific variables
-    if args.plot_type in ['variables', 'all']:
+    if args.plot_type == 'variables':
         if args.variables:
             variables = [v.strip() for v in args.variables.split(',')]
             html_path = save_html if save_html else 'variables.html'
             fig = plot_variables_plotly(df, variables, time_column=args.time_column,
-                                       save_path=html_path, show=show_plots)
+                                       save_path=html_path, show=show_plots,
+                                       max_points=args.max_points,
+                                       renderer=args.renderer, downsampler=args.downsampler,
+                                       include_plotlyjs=plotlyjs)
             if fig:
                 figures.append(fig)
-        elif args.plot_type == 'variables':
+        else:
             print("\nWarning: --variables not specified, skipping variable plot")
     
     # Plot by session
-    if args.plot_type in ['by_session', 'all']:
+    if args.plot_type == 'by_session':
         if 'session_timestamp' in df.columns:
             # Find a variable to plot
             variables = list_available_variables(df)
@@ -680,7 +1454,10 @@ def main():
                 var = variables[0]  # Use first available variable
                 html_path = save_html if save_html else f'{var}_by_session.html'
                 fig = plot_by_session_plotly(df, var, time_column=args.time_column,
-                                            save_path=html_path, show=show_plots)
+                                            save_path=html_path, show=show_plots,
+                                            max_points=args.max_points,
+                                            renderer=args.renderer, downsampler=args.downsampler,
+                                            include_plotlyjs=plotlyjs)
                 if fig:
                     figures.append(fig)
     
@@ -2,8 +2,12 @@ from rtde_receive import RTDEReceiveInterface as RTDEReceive
 import time
 import argparse
 import sys
-from datetime import datetime
 import os
+import re
+import queue
+import mmap
+import threading
+from types import MappingProxyType
 
 # RuntimeState enum values
 RUNTIME_STATE_STOPPING = 0
@@ -13,6 +17,122 @@ RUNTIME_STATE_PAUSING = 3
 RUNTIME_STATE_PAUSED = 4
 RUNTIME_STATE_RESUMING = 5
 
+RUNTIME_STATE_NAMES = {0: "STOPPING", 1: "STOPPED", 2: "PLAYING", 3: "PAUSING", 4: "PAUSED", 5: "RESUMING"}
+
+# Number of CSV columns per variable (size 1 = single value, size > 1 = vector);
+# read-only, as it is shared by variable validation, the header and the getter plan
+VARIABLE_SIZES = MappingProxyType({
+    # Single values
+    "timestamp": 1,
+    "actual_execution_time": 1,
+    "robot_mode": 1,
+    "robot_status_bits": 1,
+    "safety_mode": 1,
+    "safety_status_bits": 1,
+    "speed_scaling": 1,
+    "target_speed_fraction": 1,
+    "actual_momentum": 1,
+    "actual_main_voltage": 1,
+    "actual_robot_voltage": 1,
+    "actual_robot_current": 1,
+    "actual_digital_input_bits": 1,
+    "actual_digital_output_bits": 1,
+    "runtime_state": 1,
+    "standard_analog_input0": 1,
+    "standard_analog_input1": 1,
+    "standard_analog_output0": 1,
+    "standard_analog_output1": 1,
+    "payload": 1,
+    "speed_scaling_combined": 1,
+    # Vectors of size 6
+    "target_q": 6,
+    "target_qd": 6,
+    "target_qdd": 6,
+    "target_current": 6,
+    "target_moment": 6,
+    "actual_q": 6,
+    "actual_qd": 6,
+    "actual_current": 6,
+    "joint_control_output": 6,
+    "actual_TCP_pose": 6,
+    "actual_TCP_speed": 6,
+    "actual_TCP_force": 6,
+    "target_TCP_pose": 6,
+    "target_TCP_speed": 6,
+    "joint_temperatures": 6,
+    "actual_joint_voltage": 6,
+    "payload_inertia": 6,
+    "ft_raw_wrench": 6,
+    "actual_current_as_torque": 6,
+    # Vectors of size 3
+    "actual_tool_accelerometer": 3,
+    "payload_cog": 3,
+    # Vectors of size 6 (joint_mode is int32 vector)
+    "joint_mode": 6,
+})
+
+# RTDEReceiveInterface getter for each variable
+VARIABLE_GETTERS = {
+    "timestamp": "getTimestamp",
+    "actual_execution_time": "getActualExecutionTime",
+    "robot_mode": "getRobotMode",
+    "robot_status_bits": "getRobotStatus",
+    "safety_mode": "getSafetyMode",
+    "safety_status_bits": "getSafetyStatusBits",
+    "speed_scaling": "getSpeedScaling",
+    "target_speed_fraction": "getTargetSpeedFraction",
+    "actual_momentum": "getActualMomentum",
+    "actual_main_voltage": "getActualMainVoltage",
+    "actual_robot_voltage": "getActualRobotVoltage",
+    "actual_robot_current": "getActualRobotCurrent",
+    "actual_digital_input_bits": "getActualDigitalInputBits",
+    "actual_digital_output_bits": "getActualDigitalOutputBits",
+    "runtime_state": "getRuntimeState",
+    "standard_analog_input0": "getStandardAnalogInput0",
+    "standard_analog_input1": "getStandardAnalogInput1",
+    "standard_analog_output0": "getStandardAnalogOutput0",
+    "standard_analog_output1": "getStandardAnalogOutput1",
+    "payload": "getPayload",
+    "speed_scaling_combined": "getSpeedScalingCombined",
+    "target_q": "getTargetQ",
+    "target_qd": "getTargetQd",
+    "target_qdd": "getTargetQdd",
+    "target_current": "getTargetCurrent",
+    "target_moment": "getTargetMoment",
+    "actual_q": "getActualQ",
+    "actual_qd": "getActualQd",
+    "actual_current": "getActualCurrent",
+    "joint_control_output": "getJointControlOutput",
+    "actual_TCP_pose": "getActualTCPPose",
+    "actual_TCP_speed": "getActualTCPSpeed",
+    "actual_TCP_force": "getActualTCPForce",
+    "target_TCP_pose": "getTargetTCPPose",
+    "target_TCP_speed": "getTargetTCPSpeed",
+    "joint_temperatures": "getJointTemperatures",
+    "actual_joint_voltage": "getActualJointVoltage",
+    "payload_inertia": "getPayloadInertia",
+    "ft_raw_wrench": "getFtRawWrench",
+    "actual_current_as_torque": "getActualCurrentAsTorque",
+    "actual_tool_accelerometer": "getActualToolAccelerometer",
+    "payload_cog": "getPayloadCog",
+    "joint_mode": "getJointMode",
+}
+
+# Variables with integer values (written with %d rather than %.6f)
+INT_VARIABLES = frozenset([
+    "robot_mode", "robot_status_bits", "safety_mode", "safety_status_bits",
+    "actual_digital_input_bits", "actual_digital_output_bits", "runtime_state", "joint_mode",
+])
+
+# Output file write buffer
+FILE_BUFFER_SIZE = 1024 * 1024
+
+# Rows are flushed to the disk in writes of at least this many bytes (and when a file is closed)
+FLUSH_SIZE = 256 * 1024
+
+# Initial mapping size for --mmap-output without --max-file-size (grown as needed)
+MMAP_INITIAL_SIZE = 64 * 1024 * 1024
+
 
 def parse_args(args):
     """Parse command line parameters
@@ -77,6 +197,22 @@ def parse_args(args):
         type=float,
         default=60,
         metavar="<minutes>")
+    parser.add_argument(
+        "--decimation",
+        dest="decimation",
+        help="Record only every Nth sample (default: 1, every sample). RTDE is still polled at "
+             "the full --frequency, so timestamps stay in sync; only the rows written are reduced. "
+             "Example: --decimation 5 at 250Hz records at 50Hz.",
+        type=int,
+        default=1,
+        metavar="<N>")
+    parser.add_argument(
+        "--mmap-output",
+        dest="mmap_output",
+        help="Write output files through a memory map instead of write() calls. Each file is "
+             "pre-extended (to --max-file-size if given) and truncated to its real length when "
+             "closed; if the recorder is killed, the file is left padded with zero bytes.",
+        action="store_true")
 
     return parser.parse_args(args)
 
@@ -94,35 +230,19 @@ def load_variables_from_file(filename="record_variables_input.txt"):
     Returns:
         list: List of variable names, or empty list if file doesn't exist or is empty
     """
-    variables = []
-    
     if not os.path.exists(filename):
-        return variables
+        return []
     
     try:
         with open(filename, 'r') as f:
-            for line in f:
-                line = line.strip()
-                # Skip empty lines and comments (lines starting with #)
-                if not line or line.startswith('#'):
-                    continue
-                
-                # Handle comma-separated variables on a line
-                if ',' in line:
-                    variables.extend([v.strip() for v in line.split(',') if v.strip()])
-                else:
-                    # Single variable per line
-                    variables.append(line)
+            text = f.read()
         
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_variables = []
-        for v in variables:
-            if v not in seen:
-                seen.add(v)
-                unique_variables.append(v)
+        # Drop comment lines (lines starting with #), then split on commas and newlines
+        text = re.sub(r'(?m)^\s*#.*$', '', text)
+        variables = [v.strip() for v in re.split(r'[,\n]+', text) if v.strip()]
         
-        return unique_variables
+        # Remove duplicates while preserving order
+        return list(dict.fromkeys(variables))
     except Exception as e:
         print(f"Warning: Could not read variables from {filename}: {e}")
         return []
@@ -145,7 +265,7 @@ def add_timestamp_to_filename(filename, file_number=None, base_timestamp=None):
     
     # Generate or use provided timestamp in format: YYYY-MM-DD_HH-MM-SS
     if base_timestamp is None:
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
     else:
         timestamp = base_timestamp
     
@@ -165,211 +285,278 @@ def get_file_size_mb(filepath):
     Returns:
         float: File size in MB, or 0 if file doesn't exist
     """
-    if os.path.exists(filepath):
-        return os.path.getsize(filepath) / (1024 * 1024)
-    return 0.0
+    # A single stat() call instead of exists() + getsize()
+    try:
+        return os.stat(filepath).st_size / (1024 * 1024)
+    except FileNotFoundError:
+        return 0.0
+
+
+def build_getter_plan(variables, rtde_r, timestamp_offset=0.0):
+    """Resolve the RTDE getter for every variable once, before recording.
+    
+    Args:
+        variables (list): List of variable names, all keys of VARIABLE_SIZES
+        rtde_r: RTDEReceiveInterface instance
+        timestamp_offset (float): Offset to convert RTDE timestamp to physical time (wall-clock time)
+        
+    Returns:
+        list: One (getter, offset, size, is_int) tuple per variable, where getter is a bound
+        RTDE method (for "timestamp", one that already adds timestamp_offset), offset the
+        index of its first CSV column, size the number of CSV columns and is_int whether
+        the value is an integer
+    """
+    plan = []
+    offset = 0
+    for var in variables:
+        getter = getattr(rtde_r, VARIABLE_GETTERS[var])
+        if var == "timestamp":
+            # Convert RTDE timestamp (relative) to physical time (wall-clock)
+            getter = lambda get_timestamp=getter: get_timestamp() + timestamp_offset
+        size = VARIABLE_SIZES[var]
+        plan.append((getter, offset, size, var in INT_VARIABLES))
+        offset += size
+    return plan
+
+
+def check_variable_support(variables, rtde_r):
+    """Read every variable once to check the robot and ur_rtde version provide it.
+    
+    Args:
+        variables (list): List of variable names, all keys of VARIABLE_SIZES
+        rtde_r: RTDEReceiveInterface instance
+        
+    Returns:
+        list: One (variable, reason) tuple per unsupported variable
+    """
+    unsupported = []
+    for var in variables:
+        getter_name = VARIABLE_GETTERS[var]
+        getter = getattr(rtde_r, getter_name, None)
+        if getter is None:
+            unsupported.append((var, f"{getter_name}() is not available in this ur_rtde version"))
+            continue
+        try:
+            value = getter()
+        except Exception as e:
+            unsupported.append((var, f"{getter_name}() failed: {e}"))
+            continue
+        # A vector of the wrong length would shift every later column
+        try:
+            length = len(value)
+        except TypeError:
+            length = 1
+        if length != VARIABLE_SIZES[var]:
+            unsupported.append((var, f"expected {VARIABLE_SIZES[var]} value(s), got {length}"))
+    return unsupported
+
+
+def count_columns(plan):
+    """Count the CSV columns of a getter plan.
+    
+    Args:
+        plan (list): Getter plan from build_getter_plan
+        
+    Returns:
+        int: Number of CSV columns
+    """
+    return sum(size for _, _, size, _ in plan)
+
+
+def build_row_format(plan):
+    """Build the %-format string for one CSV row of a getter plan.
+    
+    Args:
+        plan (list): Getter plan from build_getter_plan
+        
+    Returns:
+        bytes: Format string with one "%d" (integer variables) or "%.6f" per column, ending
+        in a newline; as bytes, so rows are formatted straight to ASCII without an encode step
+    """
+    specs = []
+    for _, _, size, is_int in plan:
+        specs.extend(["%d" if is_int else "%.6f"] * size)
+    return (",".join(specs) + "\n").encode("ascii")
 
 
 def write_csv_header(file_handle, variables, rtde_r):
     """Write CSV header to file.
     
     Args:
-        file_handle: Open file handle
+        file_handle: File handle open in binary mode
         variables (list): List of variable names
         rtde_r: RTDEReceiveInterface instance
+        
+    Returns:
+        int: Number of bytes written
     """
-    # Mapping of variable names to their sizes (number of columns)
-    # Size 1 = single value, Size > 1 = vector
-    variable_sizes = {
-        # Single values
-        "timestamp": 1,
-        "actual_execution_time": 1,
-        "robot_mode": 1,
-        "robot_status_bits": 1,
-        "safety_mode": 1,
-        "safety_status_bits": 1,
-        "speed_scaling": 1,
-        "target_speed_fraction": 1,
-        "actual_momentum": 1,
-        "actual_main_voltage": 1,
-        "actual_robot_voltage": 1,
-        "actual_robot_current": 1,
-        "actual_digital_input_bits": 1,
-        "actual_digital_output_bits": 1,
-        "runtime_state": 1,
-        "standard_analog_input0": 1,
-        "standard_analog_input1": 1,
-        "standard_analog_output0": 1,
-        "standard_analog_output1": 1,
-        "payload": 1,
-        "speed_scaling_combined": 1,
-        # Vectors of size 6
-        "target_q": 6,
-        "target_qd": 6,
-        "target_qdd": 6,
-        "target_current": 6,
-        "target_moment": 6,
-        "actual_q": 6,
-        "actual_qd": 6,
-        "actual_current": 6,
-        "joint_control_output": 6,
-        "actual_TCP_pose": 6,
-        "actual_TCP_speed": 6,
-        "actual_TCP_force": 6,
-        "target_TCP_pose": 6,
-        "target_TCP_speed": 6,
-        "joint_temperatures": 6,
-        "actual_joint_voltage": 6,
-        "payload_inertia": 6,
-        "ft_raw_wrench": 6,
-        "actual_current_as_torque": 6,
-        # Vectors of size 3
-        "actual_tool_accelerometer": 3,
-        "payload_cog": 3,
-        # Vectors of size 6 (joint_mode is int32 vector)
-        "joint_mode": 6,
-    }
-    
     header_parts = []
     for var in variables:
-        size = variable_sizes.get(var, 1)  # Default to size 1 if unknown
+        size = VARIABLE_SIZES[var]
         if size > 1:
             for j in range(size):
                 header_parts.append(f"{var}_{j}")
         else:
             header_parts.append(var)
     
-    file_handle.write(",".join(header_parts) + "\n")
-    file_handle.flush()
+    header = (",".join(header_parts) + "\n").encode("ascii")
+    file_handle.write(header)
+    return len(header)
 
 
-def write_csv_row(file_handle, variables, rtde_r, timestamp_offset=0.0):
-    """Write a single row of data to CSV file.
+def read_row(plan, values):
+    """Read the values of one CSV row from RTDE.
     
     Args:
-        file_handle: Open file handle
-        variables (list): List of variable names
-        rtde_r: RTDEReceiveInterface instance
-        timestamp_offset (float): Offset to convert RTDE timestamp to physical time (wall-clock time)
+        plan (list): Getter plan from build_getter_plan
+        values (list): Preallocated list with one slot per column, reused for every row
+        
+    Returns:
+        tuple: One value per CSV column
     """
-    row_parts = []
-    for var in variables:
+    for getter, offset, size, is_int in plan:
+        if size == 1:
+            values[offset] = getter()
+        else:
+            values[offset:offset + size] = getter()
+    
+    # Snapshot the reused list; the tuple is what gets queued for writing
+    return tuple(values)
+
+
+def write_csv_rows(file_handle, row_format, rows):
+    """Write rows of data to CSV file.
+    
+    Args:
+        file_handle: File handle open in binary mode
+        row_format (bytes): Row format string from build_row_format
+        rows (list): Row tuples from read_row
+        
+    Returns:
+        int: Number of bytes written
+    """
+    # Format each row in one C-level % operation, then write the batch at once
+    data = b"".join([row_format % row for row in rows])
+    file_handle.write(data)
+    return len(data)
+
+
+class MmapWriter:
+    """Write-only file object that copies data into a memory-mapped file.
+    
+    Args:
+        filepath (str): Path to the file to create
+        size (int): Initial size of the mapping in bytes; doubled whenever it fills up
+    """
+    
+    def __init__(self, filepath, size):
+        self.name = filepath
+        self.pos = 0
+        self._file = open(filepath, 'w+b')
+        self._file.truncate(size)
+        self._mm = mmap.mmap(self._file.fileno(), size)
+    
+    def write(self, data):
+        end = self.pos + len(data)
+        if end > len(self._mm):
+            # Remap a larger file by hand; mmap.resize() is unsupported without mremap (e.g. macOS)
+            new_size = max(end, 2 * len(self._mm))
+            self._mm.close()
+            self._file.truncate(new_size)
+            self._mm = mmap.mmap(self._file.fileno(), new_size)
+        self._mm[self.pos:end] = data
+        self.pos = end
+        return len(data)
+    
+    def flush(self):
+        # Data is in the page cache as soon as it is copied into the mapping
+        pass
+    
+    def close(self):
+        self._mm.flush()
+        self._mm.close()
+        self._file.truncate(self.pos)
+        self._file.close()
+
+
+def open_output_file(filepath, mmap_size=None):
+    """Open an output file for writing CSV bytes.
+    
+    Args:
+        filepath (str): Path to the file
+        mmap_size (int, optional): Initial mapping size in bytes to write through a memory
+            map, or None for a regular buffered file
+        
+    Returns:
+        File handle open in binary mode (a MmapWriter when mmap_size is given)
+    """
+    if mmap_size:
+        return MmapWriter(filepath, mmap_size)
+    return open(filepath, 'wb', buffering=FILE_BUFFER_SIZE)
+
+
+def csv_writer_worker(write_queue, bytes_written, write_errors):
+    """Format and write batches of rows queued by the record loop (run in a background thread).
+    
+    Keeping formatting and file I/O out of the record loop keeps its RTDE timing steady.
+    
+    Args:
+        write_queue (queue.Queue): Items are (file_handle, row_format, rows) to write rows,
+            (file_handle, None, None) to close a file, or None to stop the worker
+        bytes_written (dict): Running byte count per file name, increased as rows are written
+        write_errors (list): Receives a (file name, exception) tuple for every failed write or
+            close, for the record loop to act on
+    """
+    unflushed = {}  # Bytes written per file since its last flush
+    while True:
+        item = write_queue.get()
+        if item is None:
+            break
+        file_handle, row_format, rows = item
         try:
-            # Single values
-            if var == "timestamp":
-                # Convert RTDE timestamp (relative) to physical time (wall-clock)
-                physical_timestamp = rtde_r.getTimestamp() + timestamp_offset
-                row_parts.append(f"{physical_timestamp:.6f}")
-            elif var == "actual_execution_time":
-                row_parts.append(f"{rtde_r.getActualExecutionTime():.6f}")
-            elif var == "robot_mode":
-                row_parts.append(f"{float(rtde_r.getRobotMode()):.6f}")
-            elif var == "robot_status_bits":
-                row_parts.append(f"{float(rtde_r.getRobotStatus()):.6f}")
-            elif var == "safety_mode":
-                row_parts.append(f"{float(rtde_r.getSafetyMode()):.6f}")
-            elif var == "safety_status_bits":
-                row_parts.append(f"{float(rtde_r.getSafetyStatusBits()):.6f}")
-            elif var == "speed_scaling":
-                row_parts.append(f"{rtde_r.getSpeedScaling():.6f}")
-            elif var == "target_speed_fraction":
-                row_parts.append(f"{rtde_r.getTargetSpeedFraction():.6f}")
-            elif var == "actual_momentum":
-                row_parts.append(f"{rtde_r.getActualMomentum():.6f}")
-            elif var == "actual_main_voltage":
-                row_parts.append(f"{rtde_r.getActualMainVoltage():.6f}")
-            elif var == "actual_robot_voltage":
-                row_parts.append(f"{rtde_r.getActualRobotVoltage():.6f}")
-            elif var == "actual_robot_current":
-                row_parts.append(f"{rtde_r.getActualRobotCurrent():.6f}")
-            elif var == "actual_digital_input_bits":
-                row_parts.append(f"{float(rtde_r.getActualDigitalInputBits()):.6f}")
-            elif var == "actual_digital_output_bits":
-                row_parts.append(f"{float(rtde_r.getActualDigitalOutputBits()):.6f}")
-            elif var == "runtime_state":
-                row_parts.append(f"{float(rtde_r.getRuntimeState()):.6f}")
-            elif var == "standard_analog_input0":
-                row_parts.append(f"{rtde_r.getStandardAnalogInput0():.6f}")
-            elif var == "standard_analog_input1":
-                row_parts.append(f"{rtde_r.getStandardAnalogInput1():.6f}")
-            elif var == "standard_analog_output0":
-                row_parts.append(f"{rtde_r.getStandardAnalogOutput0():.6f}")
-            elif var == "standard_analog_output1":
-                row_parts.append(f"{rtde_r.getStandardAnalogOutput1():.6f}")
-            elif var == "payload":
-                row_parts.append(f"{rtde_r.getPayload():.6f}")
-            elif var == "speed_scaling_combined":
-                row_parts.append(f"{rtde_r.getSpeedScalingCombined():.6f}")
-            # Vector values (size 6)
-            elif var == "target_q":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getTargetQ()])
-            elif var == "target_qd":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getTargetQd()])
-            elif var == "target_qdd":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getTargetQdd()])
-            elif var == "target_current":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getTargetCurrent()])
-            elif var == "target_moment":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getTargetMoment()])
-            elif var == "actual_q":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getActualQ()])
-            elif var == "actual_qd":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getActualQd()])
-            elif var == "actual_current":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getActualCurrent()])
-            elif var == "joint_control_output":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getJointControlOutput()])
-            elif var == "actual_TCP_pose":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getActualTCPPose()])
-            elif var == "actual_TCP_speed":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getActualTCPSpeed()])
-            elif var == "actual_TCP_force":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getActualTCPForce()])
-            elif var == "target_TCP_pose":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getTargetTCPPose()])
-            elif var == "target_TCP_speed":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getTargetTCPSpeed()])
-            elif var == "joint_temperatures":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getJointTemperatures()])
-            elif var == "actual_joint_voltage":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getActualJointVoltage()])
-            elif var == "payload_inertia":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getPayloadInertia()])
-            elif var == "ft_raw_wrench":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getFtRawWrench()])
-            elif var == "actual_current_as_torque":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getActualCurrentAsTorque()])
-            # Vector values (size 3)
-            elif var == "actual_tool_accelerometer":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getActualToolAccelerometer()])
-            elif var == "payload_cog":
-                row_parts.extend([f"{v:.6f}" for v in rtde_r.getPayloadCog()])
-            # Vector values (size 6, int32)
-            elif var == "joint_mode":
-                row_parts.extend([f"{float(v):.6f}" for v in rtde_r.getJointMode()])
+            if rows is None:
+                file_handle.close()
+                bytes_written.pop(file_handle.name, None)
+                unflushed.pop(file_handle.name, None)
             else:
-                # Unknown variable - try to write placeholder
-                # Check if it might be a vector by looking at the header
-                row_parts.append("0.000000")
+                n_bytes = write_csv_rows(file_handle, row_format, rows)
+                bytes_written[file_handle.name] = bytes_written.get(file_handle.name, 0) + n_bytes
+                # Flush once enough has accumulated, rather than once per batch
+                pending = unflushed.get(file_handle.name, 0) + n_bytes
+                if pending >= FLUSH_SIZE:
+                    file_handle.flush()
+                    pending = 0
+                unflushed[file_handle.name] = pending
         except Exception as e:
-            # If we can't get the variable, write placeholder
-            # For vectors, we need to write multiple placeholders
-            # We'll use the header size to determine how many
-            var_size = 1  # Default to 1
-            if var in ["target_q", "target_qd", "target_qdd", "target_current", "target_moment",
-                      "actual_q", "actual_qd", "actual_current", "joint_control_output",
-                      "actual_TCP_pose", "actual_TCP_speed", "actual_TCP_force",
-                      "target_TCP_pose", "target_TCP_speed", "joint_temperatures",
-                      "actual_joint_voltage", "payload_inertia", "ft_raw_wrench",
-                      "actual_current_as_torque", "joint_mode"]:
-                var_size = 6
-            elif var in ["actual_tool_accelerometer", "payload_cog"]:
-                var_size = 3
-            
-            row_parts.extend(["0.000000"] * var_size)
+            write_errors.append((file_handle.name, e))
+
+
+def status_worker(status_queue):
+    """Print status lines queued by the record loop (run in a background thread).
     
-    file_handle.write(",".join(row_parts) + "\n")
-    file_handle.flush()
+    Args:
+        status_queue (queue.Queue): Items are status lines to show, or None to stop the worker
+    """
+    while True:
+        status_msg = status_queue.get()
+        if status_msg is None:
+            break
+        sys.stdout.write("\r" + status_msg)
+        sys.stdout.flush()
+
+
+def queue_file_close(write_queue, file_handle, row_format, rows):
+    """Queue a file's remaining rows followed by closing the file.
+    
+    Args:
+        write_queue (queue.Queue): Queue read by csv_writer_worker
+        file_handle: Open file handle
+        row_format (bytes): Row format string from build_row_format
+        rows (list): Rows not queued yet
+    """
+    if rows:
+        write_queue.put((file_handle, row_format, rows))
+    write_queue.put((file_handle, None, None))
 
 
 def main(args):
@@ -380,6 +567,9 @@ def main(args):
     """
     args = parse_args(args)
     dt = 1 / args.frequency
+    if args.decimation < 1:
+        print("Error: --decimation must be at least 1")
+        sys.exit(1)
     
     # Parse record variables: command-line argument takes precedence, then file, then all variables
     record_variables = []
@@ -395,13 +585,38 @@ def main(args):
         else:
             print("Recording all available variables")
     
+    # Refuse unknown variables up front so the record loop never has to handle them
+    unknown_variables = [v for v in record_variables if v not in VARIABLE_SIZES]
+    if unknown_variables:
+        print(f"Error: Unknown variable(s): {', '.join(unknown_variables)}")
+        print(f"Available variables: {', '.join(VARIABLE_SIZES)}")
+        sys.exit(1)
+    
     rtde_r = RTDEReceive(args.ip, args.frequency)
+    # Getters for fields the controller or ur_rtde version lacks raise; find them before recording
+    unsupported_variables = check_variable_support(record_variables, rtde_r)
+    if unsupported_variables:
+        print("Error: Variable(s) not supported by this robot or ur_rtde version:")
+        for var, reason in unsupported_variables:
+            print(f"  {var}: {reason}")
+        sys.exit(1)
+    
+    # Resolve each variable's getter once instead of dispatching on its name every row
+    getter_plan = build_getter_plan(record_variables, rtde_r)
+    row_format = build_row_format(getter_plan)
+    row_values = [0.0] * count_columns(getter_plan)
     
     # File splitting configuration
     max_file_size_mb = args.max_file_size
     max_duration_seconds = args.max_duration * 60.0 if args.max_duration else None
+    mmap_size = None
+    if args.mmap_output:
+        # Leave headroom: the size check trails the writer thread by up to a batch
+        mmap_size = int(max_file_size_mb * 1024 * 1024) + FILE_BUFFER_SIZE if max_file_size_mb else MMAP_INITIAL_SIZE
     file_number = 1
     current_session_timestamp = None  # Timestamp for current recording session
+    output_name, output_ext = os.path.splitext(args.output)
+    session_prefix = None  # "<name>_<session timestamp>", shared by all split files of a session
     current_output_file = None
     
     # Recording state tracking
@@ -420,16 +635,44 @@ def main(args):
     print("Press [Ctrl-C] to end recording.")
     
     i = 0
-    samples_since_last_check = 0
-    check_interval = int(args.frequency)  # Check every second
+    # Runtime state check and status line run together once per second of wall time
+    next_check_time = time.monotonic() + 1.0
+    runtime_state = None  # Last state read by the check, reused by the status line
+    current_size_mb = 0.0  # Size of the current file
+    bytes_written = {}  # Bytes written per open file, counted instead of stat()-ing the file
+    
+    # Rows are collected in memory and handed to a writer thread in batches of one second;
+    # the record loop then only reads RTDE values and never formats or writes
+    row_buffer = []
+    rows_per_batch = max(1, int(args.frequency / args.decimation))
+    write_queue = queue.Queue()
+    write_errors = []  # Failed writes reported by the writer thread (e.g. disk full)
+    writer_thread = threading.Thread(target=csv_writer_worker,
+                                     args=(write_queue, bytes_written, write_errors), daemon=True)
+    writer_thread.start()
+    
+    # Status lines are printed by their own thread so a slow terminal never stalls sampling
+    status_queue = queue.Queue()
+    status_thread = threading.Thread(target=status_worker, args=(status_queue,), daemon=True)
+    status_thread.start()
     
+    recording_failed = False
     try:
         while True:
             t_start = rtde_r.initPeriod()
+            # Monotonic clock for file durations: unaffected by NTP/wall-clock jumps
+            now = time.monotonic()
+            check_due = now >= next_check_time
             
             # Check runtime_state periodically
-            if samples_since_last_check >= check_interval:
-                samples_since_last_check = 0
+            if check_due:
+                next_check_time = now + 1.0
+                runtime_state = None
+                
+                # Rows can no longer be saved, so stop instead of recording into the void
+                if write_errors:
+                    failed_file, error = write_errors[0]
+                    raise RuntimeError(f"Could not write to {failed_file}: {error}")
                 
                 try:
                     runtime_state = rtde_r.getRuntimeState()
@@ -445,7 +688,8 @@ def main(args):
                     if runtime_state == RUNTIME_STATE_PLAYING and not is_recording:
                         if stable_state_count >= stable_state_threshold:
                             # Generate new timestamp for this recording session
-                            current_session_timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+                            current_session_timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
+                            session_prefix = f"{output_name}_{current_session_timestamp}"
                             
                             # Reset file number for new session
                             file_number = 1
@@ -459,11 +703,14 @@ def main(args):
                             first_rtde_timestamp = rtde_r.getTimestamp()
                             wall_clock_time = time.time()
                             timestamp_offset = wall_clock_time - first_rtde_timestamp
+                            getter_plan = build_getter_plan(record_variables, rtde_r, timestamp_offset)
                             
                             # Open file and write header
-                            current_file_handle = open(current_output_file, 'w')
-                            write_csv_header(current_file_handle, record_variables, rtde_r)
-                            file_start_time = time.time()
+                            current_file_handle = open_output_file(current_output_file, mmap_size)
+                            bytes_written[current_output_file] = write_csv_header(current_file_handle,
+                                                                                  record_variables, rtde_r)
+                            file_start_time = now
+                            current_size_mb = 0.0
                             is_recording = True
                             has_recorded_before = True
                             stable_state_count = 0
@@ -478,12 +725,12 @@ def main(args):
                     elif runtime_state != RUNTIME_STATE_PLAYING and is_recording:
                         if stable_state_count >= 2:  # Require 2 seconds of stable non-PLAYING state
                             if current_file_handle:
-                                current_file_handle.close()
+                                queue_file_close(write_queue, current_file_handle, row_format, row_buffer)
+                                row_buffer = []
                                 current_file_handle = None
                             is_recording = False
                             stable_state_count = 0
-                            state_names = {0: "STOPPING", 1: "STOPPED", 3: "PAUSING", 4: "PAUSED", 5: "RESUMING"}
-                            state_name = state_names.get(runtime_state, f"UNKNOWN({runtime_state})")
+                            state_name = RUNTIME_STATE_NAMES.get(runtime_state, f"UNKNOWN({runtime_state})")
                             print(f"\nRobot is {state_name} - Recording stopped")
                 
                 except Exception as e:
@@ -491,25 +738,29 @@ def main(args):
                     if is_recording:
                         print(f"\nWarning: Could not check runtime_state: {e}")
             
-            # Write data row only if recording
+            # Record data row only if recording (every Nth sample with --decimation)
             if is_recording and current_file_handle:
-                write_csv_row(current_file_handle, record_variables, rtde_r, timestamp_offset)
+                if i % args.decimation == 0:
+                    row_buffer.append(read_row(getter_plan, row_values))
+                    if len(row_buffer) >= rows_per_batch:
+                        write_queue.put((current_file_handle, row_format, row_buffer))
+                        row_buffer = []
             
                 # Check if we need to split files (only when recording)
                 if is_recording and (max_file_size_mb or max_duration_seconds):
                     should_split = False
                     split_reason = ""
                     
-                    # Check file size limit
+                    # Check file size limit (a dict lookup, no syscall)
                     if max_file_size_mb:
-                        current_size_mb = get_file_size_mb(current_output_file)
+                        current_size_mb = bytes_written.get(current_output_file, 0) / (1024 * 1024)
                         if current_size_mb >= max_file_size_mb:
                             should_split = True
                             split_reason = f"file size ({current_size_mb:.2f} MB >= {max_file_size_mb} MB)"
                     
                     # Check duration limit
                     if max_duration_seconds:
-                        elapsed_seconds = time.time() - file_start_time
+                        elapsed_seconds = now - file_start_time
                         if elapsed_seconds >= max_duration_seconds:
                             should_split = True
                             split_reason = f"duration ({elapsed_seconds/60:.1f} min >= {args.max_duration} min)"
@@ -518,56 +769,70 @@ def main(args):
                     if should_split:
                         # Close current file
                         if current_file_handle:
-                            current_file_handle.close()
+                            queue_file_close(write_queue, current_file_handle, row_format, row_buffer)
+                            row_buffer = []
                         print(f"\nFile split: {split_reason}")
                         file_number += 1
-                        current_output_file = add_timestamp_to_filename(args.output, file_number, current_session_timestamp)
+                        current_output_file = f"{session_prefix}_{file_number:03d}{output_ext}"
                         
                         # Open new file
-                        current_file_handle = open(current_output_file, 'w')
-                        write_csv_header(current_file_handle, record_variables, rtde_r)
-                        file_start_time = time.time()
+                        current_file_handle = open_output_file(current_output_file, mmap_size)
+                        bytes_written[current_output_file] = write_csv_header(current_file_handle,
+                                                                              record_variables, rtde_r)
+                        file_start_time = now
+                        current_size_mb = 0.0
                         print(f"New file started: {current_output_file}")
             
-            # Status display
-            if i % 10 == 0:
-                try:
-                    runtime_state = rtde_r.getRuntimeState()
-                    state_names = {0: "STOPPING", 1: "STOPPED", 2: "PLAYING", 3: "PAUSING", 4: "PAUSED", 5: "RESUMING"}
-                    state_name = state_names.get(runtime_state, f"UNKNOWN({runtime_state})")
+            # Status display, using the state read by the check above
+            if check_due:
+                if runtime_state is not None:
+                    state_name = RUNTIME_STATE_NAMES.get(runtime_state, f"UNKNOWN({runtime_state})")
                     
                     if is_recording:
                         # Show full status when recording
                         status_msg = f"{i:6d} samples | State: {state_name} [RECORDING]"
                         if max_file_size_mb:
-                            current_size_mb = get_file_size_mb(current_output_file)
                             status_msg += f" | Size: {current_size_mb:.2f} MB"
                         if max_duration_seconds and file_start_time:
-                            elapsed_seconds = time.time() - file_start_time
+                            elapsed_seconds = now - file_start_time
                             status_msg += f" | Time: {elapsed_seconds/60:.1f} min"
                     else:
                         # Show only state when not recording
                         status_msg = f"State: {state_name} [WAITING]"
-                except:
-                    # Fallback if we can't get runtime_state
+                else:
+                    # Fallback if we couldn't get runtime_state
                     if is_recording:
                         status_msg = f"{i:6d} samples [RECORDING]"
                     else:
                         status_msg = "State: UNKNOWN [WAITING]"
                 
-                sys.stdout.write("\r" + status_msg)
-                sys.stdout.flush()
+                status_queue.put(status_msg)
             
             rtde_r.waitPeriod(t_start)
             i += 1
-            samples_since_last_check += 1
 
     except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        # e.g. an RTDE getter failing mid-recording; still save what was recorded
+        print(f"\nError: Recording failed: {e}")
+        recording_failed = True
+    finally:
         if current_file_handle:
-            current_file_handle.close()
+            queue_file_close(write_queue, current_file_handle, row_format, row_buffer)
+        # Let the writer thread drain the queue
+        write_queue.put(None)
+        writer_thread.join()
+        status_queue.put(None)
+        status_thread.join()
         print(f"\nData recording stopped. Total samples: {i}")
+        if current_file_handle:
+            print(f"Last file: {current_output_file} ({get_file_size_mb(current_output_file):.2f} MB)")
         if is_recording and file_number > 1:
             print(f"Recorded {file_number} file(s)")
+    
+    if recording_failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":